@@ -4,16 +4,18 @@ Central execution layer for Google's Agent Development Kit (ADK)
 Handles Gemini model initialization and agent prompt execution
 """
 
+import logging
 import os
-from dotenv import load_dotenv
-import google.generativeai as genai
-from typing import Optional, Dict, List, Any
+from env_loader import load_env_file
+from typing import Optional, Dict, Iterator, List, Any
 import streamlit as st
 
+logger = logging.getLogger(__name__)
+
 # ========================================
 # LOAD ENVIRONMENT VARIABLES
 # ========================================
-load_dotenv()
+load_env_file(required=("GOOGLE_API_KEY",))
 
 
 def get_env_var(key: str, default: str = None) -> str:
@@ -104,11 +106,14 @@ class GeminiADKRuntime:
         Internal method called during initialization
         """
         if not GOOGLE_API_KEY or GOOGLE_API_KEY == "your_real_key_here":
-            print("Warning: Google API key not configured. Set GOOGLE_API_KEY in .env file.")
+            logger.warning("Google API key not configured. Set GOOGLE_API_KEY in .env file.")
             self.is_configured = False
             return
         
         try:
+            # Imported here so the SDK only loads once a key is configured
+            import google.generativeai as genai
+            
             # Configure the Google Generative AI library
             genai.configure(api_key=GOOGLE_API_KEY)
             
@@ -120,11 +125,10 @@ class GeminiADKRuntime:
             )
             
             self.is_configured = True
-            print(f"✅ ADK Runtime initialized with model: {self.model_name}")
+            logger.info("ADK Runtime initialized with model: %s", self.model_name)
             
         except Exception as e:
-            error_msg = str(e)
-            print(f"❌ Error configuring ADK Runtime: {error_msg}")
+            logger.error("Error configuring ADK Runtime: %s", e)
             self.is_configured = False
     
     def run_agent_prompt(
@@ -227,6 +231,56 @@ class GeminiADKRuntime:
                 "metadata": {}
             }
     
+    def stream_agent_prompt(
+        self,
+        prompt: str,
+        system_instruction: Optional[str] = None,
+        config: Optional[Dict[str, Any]] = None
+    ) -> Iterator[str]:
+        """
+        Execute an agent prompt and yield the response text as it is generated
+        
+        Same inputs as run_agent_prompt, but the caller sees the first words
+        of a long answer without waiting for the whole completion.
+        
+        Args:
+            prompt (str): User prompt or agent query
+            system_instruction (str, optional): System-level instructions for the agent
+            config (dict, optional): Custom generation config (overrides defaults)
+        
+        Yields:
+            str: Successive chunks of response text
+        
+        Raises:
+            RuntimeError: If the runtime is not configured or the prompt is empty
+            Exception: Errors from the Gemini API are propagated to the caller
+        """
+        if not self.is_configured:
+            raise RuntimeError("ADK Runtime not configured. Please set GOOGLE_API_KEY in .env file.")
+        
+        if not prompt:
+            raise RuntimeError("Prompt cannot be empty.")
+        
+        full_prompt = prompt
+        if system_instruction:
+            full_prompt = f"{system_instruction}\n\n{prompt}"
+        
+        response = self.model.generate_content(
+            full_prompt,
+            generation_config=config if config else DEFAULT_MODEL_CONFIG,
+            stream=True
+        )
+        
+        for chunk in response:
+            try:
+                text = chunk.text
+            except ValueError:
+                # Chunks blocked by safety filters (or carrying no parts)
+                # raise instead of returning empty text; skip them
+                continue
+            if text:
+                yield text
+    
     def run_agent_chat(
         self,
         messages: List[Dict[str, str]],
@@ -337,6 +391,24 @@ def run_agent(prompt: str, system_instruction: Optional[str] = None) -> Dict[str
     return adk_runtime.run_agent_prompt(prompt, system_instruction)
 
 
+def stream_agent(prompt: str, system_instruction: Optional[str] = None) -> Iterator[str]:
+    """
+    Convenience function to stream an agent prompt using the global runtime
+    
+    Args:
+        prompt (str): User prompt
+        system_instruction (str, optional): System instruction
+    
+    Yields:
+        str: Successive chunks of response text
+    
+    Example:
+        for chunk in stream_agent("Explain my health drift pattern"):
+            print(chunk, end="")
+    """
+    return adk_runtime.stream_agent_prompt(prompt, system_instruction)
+
+
 def is_adk_ready() -> bool:
     """
     Check if ADK is ready for use
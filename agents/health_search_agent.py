@@ -8,9 +8,9 @@ import requests
 from typing import Dict, Any, Optional, List
 from datetime import datetime
 import os
-from dotenv import load_dotenv
+from env_loader import load_env_file
 
-load_dotenv()
+load_env_file(required=("VISION_API_KEY", "VISION_MODEL"))
 
 # Get OpenRouter API credentials
 VISION_API_KEY = os.getenv("VISION_API_KEY")
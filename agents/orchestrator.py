@@ -14,6 +14,7 @@ Agent Execution Order (CRITICAL):
 5. care_agent → Provides ACTIONABLE GUIDANCE (user-visible value)
 """
 
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional, Any
 from agents.adk_runtime import is_adk_ready
 from agents.drift_agent import DriftAgent
@@ -137,130 +138,102 @@ class HealthDriftOrchestrator:
             # Calculate drift percentage for agents
             drift_percentage = ((recent_value - baseline_value) / baseline_value) * 100
             
-            # ========================================
-            # AGENT 1: DRIFT AGENT
-            # Detects WHAT changed through numerical feature drift detection
-            # ========================================
-            
-            consolidated_response['pipeline_metadata']['execution_order'].append("drift_agent")
-            consolidated_response['pipeline_metadata']['agents_executed'] += 1
-            
-            # Execute drift analysis
-            drift_result = self.drift_agent.analyze_drift(
-                metric_name=metric_name,
-                baseline_value=baseline_value,
-                recent_value=recent_value,
-                drift_percentage=drift_percentage,
-                days_observed=len(drift_history) if drift_history else 1,
-                additional_context=user_profile
-            )
-            
-            # Store drift analysis output
-            consolidated_response['drift_summary'] = drift_result
-            
-            if drift_result.get('success'):
-                consolidated_response['pipeline_metadata']['agents_successful'] += 1
-            
-            # ========================================
-            # AGENT 2: CONTEXT AGENT
-            # Explains WHY changes might have occurred based on user context
-            # ========================================
-            
-            consolidated_response['pipeline_metadata']['execution_order'].append("context_agent")
-            consolidated_response['pipeline_metadata']['agents_executed'] += 1
-            
-            # Execute context analysis (uses drift results + user context)
-            context_result = self.context_agent.analyze_with_context(
-                drift_analysis=drift_result,
-                user_profile=user_profile or {},
-                user_id=user_id or ""
-            )
-            
-            # Store context analysis output
-            consolidated_response['contextual_explanation'] = context_result
-            
-            if context_result.get('success'):
-                consolidated_response['pipeline_metadata']['agents_successful'] += 1
-            
-            # ========================================
-            # AGENT 3: RISK AGENT
-            # Evaluates HOW CONCERNING the pattern is over time
-            # ========================================
-            
-            consolidated_response['pipeline_metadata']['execution_order'].append("risk_agent")
-            consolidated_response['pipeline_metadata']['agents_executed'] += 1
-            
-            # Execute risk assessment (uses drift history for temporal analysis)
-            if drift_history and len(drift_history) >= 2:
-                risk_result = self.risk_agent.analyze_risk_over_time(
-                    drift_history=drift_history,
+            metadata = consolidated_response['pipeline_metadata']
+            
+            def record(agent_name, output_key, agent_result):
+                """Store one agent's output and update the pipeline counters."""
+                metadata['execution_order'].append(agent_name)
+                metadata['agents_executed'] += 1
+                consolidated_response[output_key] = agent_result
+                if agent_result.get('success'):
+                    metadata['agents_successful'] += 1
+            
+            # Each agent is a blocking Gemini call. Risk only needs the drift
+            # history and care does not read the safety verdict, so those two
+            # run on a worker thread alongside the rest of the chain.
+            with ThreadPoolExecutor(max_workers=2, thread_name_prefix="health-agent") as pool:
+                # ========================================
+                # AGENT 3: RISK AGENT (started first, runs alongside 1 and 2)
+                # Evaluates HOW CONCERNING the pattern is over time
+                # ========================================
+                risk_future = None
+                if drift_history and len(drift_history) >= 2:
+                    risk_future = pool.submit(
+                        self.risk_agent.analyze_risk_over_time,
+                        drift_history=drift_history,
+                        metric_name=metric_name,
+                        baseline_value=baseline_value,
+                        user_context=user_profile
+                    )
+                
+                # ========================================
+                # AGENT 1: DRIFT AGENT
+                # Detects WHAT changed through numerical feature drift detection
+                # ========================================
+                drift_result = self.drift_agent.analyze_drift(
                     metric_name=metric_name,
                     baseline_value=baseline_value,
-                    user_context=user_profile
+                    recent_value=recent_value,
+                    drift_percentage=drift_percentage,
+                    days_observed=len(drift_history) if drift_history else 1,
+                    additional_context=user_profile
                 )
-            else:
-                # Fallback: Single-point risk assessment
-                risk_result = {
-                    "success": True,
-                    "risk_level": "temporary",  # Default for single measurement
-                    "trend_description": "Single measurement - trend not yet established",
-                    "confidence_score": 0.3,  # Low confidence with limited data
-                    "reasoning": "Risk assessment requires multiple days of data for accurate evaluation.",
-                    "days_observed": 1,
-                    "consistency_score": 0.0,
-                    "is_worsening": False,
-                    "recommendations": ["Continue daily monitoring to establish trend"]
-                }
-            
-            # Store risk assessment output
-            consolidated_response['risk_assessment'] = risk_result
-            
-            if risk_result.get('success'):
-                consolidated_response['pipeline_metadata']['agents_successful'] += 1
-            
-            # ========================================
-            # AGENT 4: SAFETY AGENT
-            # Decides IF ESCALATION to professional care is needed (ethical guardrail)
-            # ========================================
-            
-            consolidated_response['pipeline_metadata']['execution_order'].append("safety_agent")
-            consolidated_response['pipeline_metadata']['agents_executed'] += 1
-            
-            # Execute safety evaluation (reviews all prior agent outputs)
-            safety_result = self.safety_agent.evaluate_safety(
-                drift_analysis=drift_result,
-                risk_analysis=risk_result,
-                context_analysis=context_result,
-                user_reported_symptoms=user_symptoms
-            )
-            
-            # Store safety evaluation output
-            consolidated_response['safety_notice'] = safety_result
-            
-            if safety_result.get('success'):
-                consolidated_response['pipeline_metadata']['agents_successful'] += 1
-            
-            # ========================================
-            # AGENT 5: CARE AGENT
-            # Provides ACTIONABLE GUIDANCE for user (user-visible value)
-            # ========================================
-            
-            consolidated_response['pipeline_metadata']['execution_order'].append("care_agent")
-            consolidated_response['pipeline_metadata']['agents_executed'] += 1
-            
-            # Execute care guidance generation (synthesizes all insights)
-            care_result = self.care_agent.generate_guidance(
-                drift_analysis=drift_result,
-                context_analysis=context_result,
-                risk_analysis=risk_result,
-                user_profile=user_profile
-            )
-            
-            # Store care guidance output
-            consolidated_response['care_guidance'] = care_result
-            
-            if care_result.get('success'):
-                consolidated_response['pipeline_metadata']['agents_successful'] += 1
+                record("drift_agent", 'drift_summary', drift_result)
+                
+                # ========================================
+                # AGENT 2: CONTEXT AGENT
+                # Explains WHY changes might have occurred based on user context
+                # ========================================
+                context_result = self.context_agent.analyze_with_context(
+                    drift_analysis=drift_result,
+                    user_profile=user_profile or {},
+                    user_id=user_id or ""
+                )
+                record("context_agent", 'contextual_explanation', context_result)
+                
+                if risk_future is not None:
+                    risk_result = risk_future.result()
+                else:
+                    # Fallback: Single-point risk assessment
+                    risk_result = {
+                        "success": True,
+                        "risk_level": "temporary",  # Default for single measurement
+                        "trend_description": "Single measurement - trend not yet established",
+                        "confidence_score": 0.3,  # Low confidence with limited data
+                        "reasoning": "Risk assessment requires multiple days of data for accurate evaluation.",
+                        "days_observed": 1,
+                        "consistency_score": 0.0,
+                        "is_worsening": False,
+                        "recommendations": ["Continue daily monitoring to establish trend"]
+                    }
+                record("risk_agent", 'risk_assessment', risk_result)
+                
+                # ========================================
+                # AGENT 5: CARE AGENT (runs alongside 4)
+                # Provides ACTIONABLE GUIDANCE for user (user-visible value)
+                # ========================================
+                care_future = pool.submit(
+                    self.care_agent.generate_guidance,
+                    drift_analysis=drift_result,
+                    context_analysis=context_result,
+                    risk_analysis=risk_result,
+                    user_profile=user_profile
+                )
+                
+                # ========================================
+                # AGENT 4: SAFETY AGENT
+                # Decides IF ESCALATION to professional care is needed (ethical guardrail)
+                # ========================================
+                safety_result = self.safety_agent.evaluate_safety(
+                    drift_analysis=drift_result,
+                    risk_analysis=risk_result,
+                    context_analysis=context_result,
+                    user_reported_symptoms=user_symptoms
+                )
+                record("safety_agent", 'safety_notice', safety_result)
+                
+                care_result = care_future.result()
+                record("care_agent", 'care_guidance', care_result)
             
             # ========================================
             # PIPELINE COMPLETION
@@ -3,8 +3,11 @@ MediGuard Drift AI - Daily Health Drift Monitoring System
 Entry point for the Streamlit application
 """
 
+import html
+import importlib
+import logging
+
 import streamlit as st
-from auth.supabase_auth import sign_in, sign_up, sign_out, is_configured, get_redirect_url
 
 # ========================================
 # PAGE CONFIGURATION
@@ -16,64 +19,240 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+logger = logging.getLogger(__name__)
+
+# ========================================
+# STATIC PAGE MARKUP
+# ========================================
+# Each st.markdown call is a separate message to the browser, so the static
+# blocks below are concatenated and emitted together wherever possible.
+
 # Hide Streamlit's default page navigation
-st.markdown("""
+_HIDE_NAV_CSS = """
     <style>
     [data-testid="stSidebarNav"] {
         display: none;
     }
     </style>
-""", unsafe_allow_html=True)
+"""
+
+# Hide sidebar when not authenticated
+_HIDE_SIDEBAR_CSS = """
+    <style>
+    [data-testid="stSidebar"] {
+        display: none;
+    }
+    </style>
+"""
+
+_LOGIN_HERO_HTML = """
+    <div style='text-align: center; padding: 3rem 0 2rem 0;'>
+        <h1 style='color: #4A90E2; font-size: 3rem;'>🏥 MediGuard Drift AI</h1>
+        <p style='font-size: 1.3rem; color: #666; margin-top: 1rem;'>
+            Daily Health Drift Monitoring System
+        </p>
+    </div>
+    <hr>
+"""
+
+# Custom CSS for healthcare theme
+_THEME_CSS = """
+    <style>
+    /* Main theme colors */
+    :root {
+        --primary-color: #4A90E2;
+        --secondary-color: #50C878;
+        --background-color: #F8FAFB;
+    }
+    
+    /* Header styling */
+    .main-header {
+        background: linear-gradient(135deg, #4A90E2 0%, #50C878 100%);
+        padding: 2rem;
+        border-radius: 10px;
+        margin-bottom: 2rem;
+        box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
+    }
+    
+    .main-header h1 {
+        color: white;
+        margin: 0;
+        font-size: 2.5rem;
+        font-weight: 700;
+    }
+    
+    .main-header p {
+        color: #E8F4F8;
+        margin: 0.5rem 0 0 0;
+        font-size: 1.1rem;
+    }
+    
+    /* Sidebar styling */
+    .sidebar .sidebar-content {
+        background-color: #F8FAFB;
+    }
+    
+    /* Navigation buttons */
+    div[data-testid="stSidebar"] > div:first-child {
+        background-color: #F0F7FF;
+    }
+    
+    /* Main content area */
+    .main .block-container {
+        padding-top: 2rem;
+        padding-bottom: 2rem;
+    }
+    </style>
+"""
+
+_HEADER_HTML = """
+    <div class="main-header">
+        <h1>🏥 MediGuard Drift AI</h1>
+        <p>Daily Health Drift Monitoring System - Your Personal Health Guardian</p>
+    </div>
+"""
+
+_FOOTER_HTML = """
+    <hr>
+    <div style='text-align: center; color: #666; padding: 1rem;'>
+        <p>🏥 MediGuard Drift AI - Protecting Your Health, One Day at a Time</p>
+        <p style='font-size: 0.8rem;'>For medical emergencies, please call your local emergency services immediately.</p>
+    </div>
+"""
+
+# Navigation menu options as (label, page name) pairs
+_MENU_OPTIONS = (
+    ("🏠 Home", "Home"),
+    ("👤 Profile", "Profile"),
+    ("📝 Health Context", "Health Context"),
+    ("🩺 Daily Health Check", "Daily Health Check"),
+    ("📊 Dashboard", "Dashboard"),
+    ("💬 AI Health Chat", "AI Health Chat"),
+    ("📖 Guide", "Guide"),
+)
+
+# Page name -> module implementing show()
+_PAGE_ROUTES = {
+    "Home": "pages.home",
+    "Profile": "pages.profile",
+    "Health Context": "pages.context_inputs",
+    "Daily Health Check": "pages.daily_health_check",
+    "Dashboard": "pages.dashboard",
+    "AI Health Chat": "pages.ai_health_chat",
+    "Guide": "pages.guide",
+}
+
+# Session state keys and their initial values
+_SESSION_DEFAULTS = (
+    ("authenticated", False),
+    ("user_email", None),
+    ("user_id", None),
+    ("current_page", "Home"),
+)
+
+# Pre-joined blocks so reruns don't rebuild the combined strings
+_LOGIN_PAGE_HTML = _HIDE_NAV_CSS + _HIDE_SIDEBAR_CSS + _LOGIN_HERO_HTML
+_APP_HEADER_HTML = _HIDE_NAV_CSS + _THEME_CSS + _HEADER_HTML
+
+_AUTH_NOT_CONFIGURED_MSG = """
+🔧 **Authentication Not Configured**
+
+Please configure your Supabase credentials in the `.env` file to enable authentication.
+
+1. Create a Supabase project at https://supabase.com
+2. Update `.env` with your project URL and anon key
+3. Restart the application
+"""
+
+_EMAIL_VERIFICATION_MSG = """
+📧 **Email Verification:** Depending on your Supabase settings, you may need to verify 
+your email before you can log in. Check your inbox for a verification link.
+"""
+
+# "Secure Authentication" section laid out as a 3-column grid in one block
+_SECURE_AUTH_HTML = """
+    <hr>
+    <h3>🔒 Secure Authentication</h3>
+    <div style='display: grid; grid-template-columns: repeat(3, 1fr); gap: 1rem;'>
+        <div>
+            <p><strong>🛡️ Privacy First</strong></p>
+            <p>Your health data is personal. We use enterprise-grade authentication 
+            to keep your information secure.</p>
+        </div>
+        <div>
+            <p><strong>🔐 Encrypted Storage</strong></p>
+            <p>All data is encrypted at rest and in transit using industry-standard 
+            security protocols.</p>
+        </div>
+        <div>
+            <p><strong>👤 Your Data, Your Control</strong></p>
+            <p>You own your health data. Access it anytime, export it, or delete 
+            it whenever you want.</p>
+        </div>
+    </div>
+"""
+
+_ABOUT_MSG = """
+**MediGuard Drift AI** monitors your daily health metrics 
+and detects subtle changes that may indicate health drift.
+"""
+
+_MISSING_PAGE_NOTE = """
+**Developer Note:** Please create the following structure:
+```
+pages/
+├── __init__.py
+├── home.py
+├── profile.py
+├── daily_health_check.py
+├── dashboard.py
+└── ai_health_chat.py
+```
+Each page module should have a `show()` function.
+"""
+
+
+def _user_chip_html(email: str) -> str:
+    """
+    Build the "Logged in as" sidebar chip for a user
+    
+    Args:
+        email (str): Email address of the logged-in user
+    
+    Returns:
+        str: HTML snippet for the sidebar chip (email is HTML-escaped)
+    """
+    safe_email = html.escape(email)
+    return f"""
+        <div style='background: #E3F2FD; padding: 1rem; border-radius: 8px; margin-bottom: 1rem;'>
+            <p style='margin: 0; font-size: 0.9rem; color: #666;'>Logged in as:</p>
+            <p style='margin: 0.3rem 0 0 0; font-weight: bold; color: #4A90E2;'>
+                {safe_email}
+            </p>
+        </div>
+    """
 
 # ========================================
 # AUTHENTICATION GATE (HARD GATE)
 # ========================================
-# Initialize authentication state
-if 'authenticated' not in st.session_state:
-    st.session_state.authenticated = False
-if 'user_email' not in st.session_state:
-    st.session_state.user_email = None
-if 'user_id' not in st.session_state:
-    st.session_state.user_id = None
+# Initialize authentication and page routing state in one pass
+for _key, _default in _SESSION_DEFAULTS:
+    st.session_state.setdefault(_key, _default)
 
 # Check if user is authenticated
 if not st.session_state.authenticated:
     # ========================================
     # LOGIN/SIGNUP PAGE (BLOCKING ALL OTHER CONTENT)
     # ========================================
+    # Imported here so authenticated reruns never load the Supabase client
+    from auth.supabase_auth import sign_in, sign_up, is_configured, get_redirect_url
     
-    # Hide sidebar when not authenticated
-    st.markdown("""
-        <style>
-        [data-testid="stSidebar"] {
-            display: none;
-        }
-        </style>
-    """, unsafe_allow_html=True)
-    
-    # Display login page
-    st.markdown("""
-        <div style='text-align: center; padding: 3rem 0 2rem 0;'>
-            <h1 style='color: #4A90E2; font-size: 3rem;'>🏥 MediGuard Drift AI</h1>
-            <p style='font-size: 1.3rem; color: #666; margin-top: 1rem;'>
-                Daily Health Drift Monitoring System
-            </p>
-        </div>
-    """, unsafe_allow_html=True)
-    
-    st.markdown("---")
+    # Hide sidebar and display login page in a single render
+    st.markdown(_LOGIN_PAGE_HTML, unsafe_allow_html=True)
     
     # Check if Supabase is configured
     if not is_configured():
-        st.error("""
-        🔧 **Authentication Not Configured**
-        
-        Please configure your Supabase credentials in the `.env` file to enable authentication.
-        
-        1. Create a Supabase project at https://supabase.com
-        2. Update `.env` with your project URL and anon key
-        3. Restart the application
-        """)
+        st.error(_AUTH_NOT_CONFIGURED_MSG)
         st.stop()
     
     # Create tabs for Login and Sign Up
@@ -175,170 +354,70 @@ if not st.session_state.authenticated:
                             st.error(f"❌ {message}")
         
         st.markdown("<br>", unsafe_allow_html=True)
-        st.warning("""
-        📧 **Email Verification:** Depending on your Supabase settings, you may need to verify 
-        your email before you can log in. Check your inbox for a verification link.
-        """)
+        st.warning(_EMAIL_VERIFICATION_MSG)
     
     # ========================================
     # INFORMATION SECTION
     # ========================================
-    st.markdown("---")
-    st.markdown("### 🔒 Secure Authentication")
-    
-    col1, col2, col3 = st.columns(3)
-    
-    with col1:
-        st.markdown("""
-        **🛡️ Privacy First**
-        
-        Your health data is personal. We use enterprise-grade authentication 
-        to keep your information secure.
-        """)
-    
-    with col2:
-        st.markdown("""
-        **🔐 Encrypted Storage**
-        
-        All data is encrypted at rest and in transit using industry-standard 
-        security protocols.
-        """)
-    
-    with col3:
-        st.markdown("""
-        **👤 Your Data, Your Control**
-        
-        You own your health data. Access it anytime, export it, or delete 
-        it whenever you want.
-        """)
+    st.markdown(_SECURE_AUTH_HTML, unsafe_allow_html=True)
     
     # Stop execution here - don't render any other content
     st.stop()
 
 # ========================================
-# CUSTOM CSS FOR HEALTHCARE THEME
+# THEME AND HEADER SECTION
 # ========================================
-st.markdown("""
-    <style>
-    /* Main theme colors */
-    :root {
-        --primary-color: #4A90E2;
-        --secondary-color: #50C878;
-        --background-color: #F8FAFB;
-    }
-    
-    /* Header styling */
-    .main-header {
-        background: linear-gradient(135deg, #4A90E2 0%, #50C878 100%);
-        padding: 2rem;
-        border-radius: 10px;
-        margin-bottom: 2rem;
-        box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
-    }
-    
-    .main-header h1 {
-        color: white;
-        margin: 0;
-        font-size: 2.5rem;
-        font-weight: 700;
-    }
-    
-    .main-header p {
-        color: #E8F4F8;
-        margin: 0.5rem 0 0 0;
-        font-size: 1.1rem;
-    }
-    
-    /* Sidebar styling */
-    .sidebar .sidebar-content {
-        background-color: #F8FAFB;
-    }
-    
-    /* Navigation buttons */
-    div[data-testid="stSidebar"] > div:first-child {
-        background-color: #F0F7FF;
-    }
-    
-    /* Main content area */
-    .main .block-container {
-        padding-top: 2rem;
-        padding-bottom: 2rem;
-    }
-    </style>
-""", unsafe_allow_html=True)
-
-# ========================================
-# SESSION STATE INITIALIZATION
-# ========================================
-# Initialize session state for page routing if not already set
-if 'current_page' not in st.session_state:
-    st.session_state.current_page = 'Home'
-
-# ========================================
-# HEADER SECTION
-# ========================================
-st.markdown("""
-    <div class="main-header">
-        <h1>🏥 MediGuard Drift AI</h1>
-        <p>Daily Health Drift Monitoring System - Your Personal Health Guardian</p>
-    </div>
-""", unsafe_allow_html=True)
+st.markdown(_APP_HEADER_HTML, unsafe_allow_html=True)
 
 # ========================================
-# USER IS AUTHENTICATED - SHOW MAIN APP
+# USER IS AUTHENTICATED - SIDEBAR (USER INFO + NAVIGATION)
 # ========================================
-
-# Display user info in sidebar header
-with st.sidebar:
-    st.markdown(f"""
-        <div style='background: #E3F2FD; padding: 1rem; border-radius: 8px; margin-bottom: 1rem;'>
-            <p style='margin: 0; font-size: 0.9rem; color: #666;'>Logged in as:</p>
-            <p style='margin: 0.3rem 0 0 0; font-weight: bold; color: #4A90E2;'>
-                {st.session_state.user_email}
-            </p>
-        </div>
-    """, unsafe_allow_html=True)
-    
-    # Logout button
-    if st.button("🚪 Logout", use_container_width=True):
-        # Clear authentication state
-        st.session_state.authenticated = False
-        st.session_state.user_email = None
-        st.session_state.user_id = None
-        st.session_state.current_page = 'Home'
+def render_sidebar(user_email: str = None):
+    """
+    Render the sidebar: user chip and logout (when logged in), navigation
+    menu, and the About block
+    
+    Args:
+        user_email (str, optional): Email of the logged-in user; the user
+            chip and logout button are skipped when not provided
+    """
+    if user_email:
+        # Display user info in sidebar header
+        st.markdown(_user_chip_html(user_email), unsafe_allow_html=True)
         
-        # Sign out from Supabase
-        sign_out()
+        # Logout button
+        if st.button("🚪 Logout", use_container_width=True):
+            # Clear authentication state (defaults are restored on rerun)
+            for key, _ in _SESSION_DEFAULTS:
+                st.session_state.pop(key, None)
+            
+            # Sign out from Supabase before rerunning, so a quick re-login
+            # cannot be cleared by a late sign-out; never block logout on
+            # a service error
+            try:
+                from auth.supabase_auth import sign_out
+                success, message = sign_out()
+                if not success:
+                    logger.warning("Supabase sign out failed: %s", message)
+            except Exception:
+                logger.exception("Supabase sign out failed")
+            
+            st.rerun()
         
-        st.success("Logged out successfully!")
-        st.rerun()
+        st.markdown("---")
     
-    st.markdown("---")
-
-# ========================================
-# SIDEBAR NAVIGATION
-# ========================================
-with st.sidebar:
     st.markdown("### 🏥 MediGuard Drift AI")
     st.markdown("---")
     
-    # Navigation menu options
-    menu_options = {
-        "🏠 Home": "Home",
-        "👤 Profile": "Profile",
-        "📝 Health Context": "Health Context",
-        "🩺 Daily Health Check": "Daily Health Check",
-        "📊 Dashboard": "Dashboard",
-        "💬 AI Health Chat": "AI Health Chat",
-        "📖 Guide": "Guide"
-    }
-    
     # Create navigation buttons with highlighting
-    for label, page_name in menu_options.items():
-        is_current = st.session_state.current_page == page_name
-        button_type = "primary" if is_current else "secondary"
-        
-        if st.button(label, key=page_name, use_container_width=True, type=button_type):
+    current_page = st.session_state.current_page
+    for label, page_name in _MENU_OPTIONS:
+        if st.button(
+            label,
+            key=page_name,
+            use_container_width=True,
+            type="primary" if page_name == current_page else "secondary"
+        ):
             st.session_state.current_page = page_name
             st.rerun()
     
@@ -346,15 +425,16 @@ with st.sidebar:
     
     # Additional sidebar information
     st.markdown("### ℹ️ About")
-    st.info("""
-        **MediGuard Drift AI** monitors your daily health metrics 
-        and detects subtle changes that may indicate health drift.
-    """)
+    st.info(_ABOUT_MSG)
     
     st.markdown("---")
     st.markdown("**Version:** 2.0.0")
     st.markdown("**© 2025 MediGuard**")
 
+
+with st.sidebar:
+    render_sidebar(st.session_state.user_email)
+
 # ========================================
 # PAGE ROUTING LOGIC
 # ========================================
@@ -363,59 +443,19 @@ current_page = st.session_state.current_page
 
 try:
     # Import and load the selected page from the pages folder
-    if current_page == "Home":
-        from pages import home
-        home.show()
-    
-    elif current_page == "Profile":
-        from pages import profile
-        profile.show()
-    
-    elif current_page == "Health Context":
-        from pages import context_inputs
-        context_inputs.show()
-    
-    elif current_page == "Daily Health Check":
-        from pages import daily_health_check
-        daily_health_check.show()
-    
-    elif current_page == "Dashboard":
-        from pages import dashboard
-        dashboard.show()
-    
-    elif current_page == "AI Health Chat":
-        from pages import ai_health_chat
-        ai_health_chat.show()
-    
-    elif current_page == "Guide":
-        from pages import guide
-        guide.show()
+    page_module = _PAGE_ROUTES.get(current_page)
+    if page_module is None:
+        st.error(f"⚠️ Unknown page '{current_page}'.")
+    else:
+        importlib.import_module(page_module).show()
 
 except ImportError as e:
     # Handle missing page modules gracefully
     st.error(f"⚠️ Page '{current_page}' is not yet implemented.")
-    st.info("""
-        **Developer Note:** Please create the following structure:
-        ```
-        pages/
-        ├── __init__.py
-        ├── home.py
-        ├── profile.py
-        ├── daily_health_check.py
-        ├── dashboard.py
-        └── ai_health_chat.py
-        ```
-        Each page module should have a `show()` function.
-    """)
+    st.info(_MISSING_PAGE_NOTE)
     st.exception(e)
 
 # ========================================
 # FOOTER
 # ========================================
-st.markdown("---")
-st.markdown("""
-    <div style='text-align: center; color: #666; padding: 1rem;'>
-        <p>🏥 MediGuard Drift AI - Protecting Your Health, One Day at a Time</p>
-        <p style='font-size: 0.8rem;'>For medical emergencies, please call your local emergency services immediately.</p>
-    </div>
-""", unsafe_allow_html=True)
+st.markdown(_FOOTER_HTML, unsafe_allow_html=True)
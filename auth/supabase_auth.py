@@ -4,15 +4,21 @@ Handles user authentication for MediGuard Drift AI
 """
 
 import os
-from dotenv import load_dotenv
-from supabase import create_client, Client
-from typing import Dict, Tuple
+import re
+from functools import lru_cache
+from env_loader import load_env_file
+from typing import Dict, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from supabase import Client
 
 # ========================================
 # LOAD ENVIRONMENT VARIABLES
 # ========================================
 # Load environment variables from .env file (for local development)
-load_dotenv()
+# STREAMLIT_APP_URL and the Streamlit Cloud markers are optional and read
+# with os.getenv defaults, so they do not force a .env read
+load_env_file(required=("SUPABASE_URL", "SUPABASE_ANON_KEY"))
 
 # Try to import streamlit for secrets support (when deployed)
 try:
@@ -49,6 +55,48 @@ def get_env_var(key: str, default: str = None) -> str:
 SUPABASE_URL = get_env_var("SUPABASE_URL")
 SUPABASE_ANON_KEY = get_env_var("SUPABASE_ANON_KEY")
 
+# Basic shape check for email addresses (local@domain.tld)
+_EMAIL_RE = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+
+# ========================================
+# ERROR MESSAGE TABLES
+# ========================================
+# Map Supabase error text to user-friendly messages (first match wins)
+_SIGNUP_ERRORS = (
+    (re.compile(r"already registered", re.I),
+     "This email is already registered. Please sign in instead."),
+    (re.compile(r"invalid email", re.I),
+     "Invalid email format. Please check and try again."),
+    (re.compile(r"weak password", re.I),
+     "Password is too weak. Use a stronger password."),
+)
+
+_SIGNIN_ERRORS = (
+    (re.compile(r"invalid credentials|invalid login", re.I),
+     "Invalid email or password. Please try again."),
+    (re.compile(r"email not confirmed", re.I),
+     "Please verify your email before signing in."),
+    (re.compile(r"too many requests", re.I),
+     "Too many login attempts. Please try again later."),
+)
+
+
+def _match_error(error_message: str, table: tuple) -> str:
+    """
+    Find the friendly message for a raw Supabase error
+    
+    Args:
+        error_message (str): Raw error text from Supabase
+        table (tuple): Sequence of (compiled pattern, message) pairs
+    
+    Returns:
+        str: Matching friendly message, or None if no pattern matches
+    """
+    for pattern, message in table:
+        if pattern.search(error_message):
+            return message
+    return None
+
 # ========================================
 # HELPER FUNCTIONS
 # ========================================
@@ -79,9 +127,9 @@ def get_redirect_url() -> str:
 # ========================================
 # INITIALIZE SUPABASE CLIENT
 # ========================================
-def get_supabase_client() -> Client:
+def create_supabase_client() -> "Client":
     """
-    Initialize and return Supabase client
+    Initialize and return a new Supabase client
     
     Returns:
         Client: Configured Supabase client instance
@@ -101,12 +149,35 @@ def get_supabase_client() -> Client:
             "Supabase credentials."
         )
     
+    # Imported here so the SDK only loads once credentials are present
+    from supabase import create_client
+    
     return create_client(SUPABASE_URL, SUPABASE_ANON_KEY)
 
 
-# Create a global client instance
+@lru_cache(maxsize=1)
+def get_supabase_client() -> "Client":
+    """
+    Return the shared Supabase client used for data access
+    
+    The client is created on first use and reused afterwards, so repeated
+    queries share its HTTP connection pool instead of opening a new
+    connection (and TLS handshake) per call. It is kept separate from the
+    authentication client below so data queries never pick up another
+    user's login session.
+    
+    Returns:
+        Client: Configured Supabase client instance
+    
+    Raises:
+        ValueError: If environment variables are not set
+    """
+    return create_supabase_client()
+
+
+# Create a global client instance for authentication
 try:
-    supabase: Client = get_supabase_client()
+    supabase: "Client" = create_supabase_client()
 except ValueError as e:
     # Client will be None if credentials are not properly configured
     supabase = None
@@ -149,7 +220,7 @@ def sign_up(email: str, password: str, redirect_url: str = None) -> Tuple[bool,
     if len(password) < 6:
         return False, "Password must be at least 6 characters long.", {}
     
-    if "@" not in email:
+    if not _EMAIL_RE.match(email):
         return False, "Please enter a valid email address.", {}
     
     try:
@@ -182,15 +253,11 @@ def sign_up(email: str, password: str, redirect_url: str = None) -> Tuple[bool,
     except Exception as e:
         # Handle specific error cases
         error_message = str(e)
+        friendly_message = _match_error(error_message, _SIGNUP_ERRORS)
         
-        if "already registered" in error_message.lower():
-            return False, "This email is already registered. Please sign in instead.", {}
-        elif "invalid email" in error_message.lower():
-            return False, "Invalid email format. Please check and try again.", {}
-        elif "weak password" in error_message.lower():
-            return False, "Password is too weak. Use a stronger password.", {}
-        else:
-            return False, f"Sign up error: {error_message}", {}
+        if friendly_message:
+            return False, friendly_message, {}
+        return False, f"Sign up error: {error_message}", {}
 
 
 def sign_in(email: str, password: str) -> Tuple[bool, str, Dict]:
@@ -221,6 +288,10 @@ def sign_in(email: str, password: str) -> Tuple[bool, str, Dict]:
     if not email or not password:
         return False, "Email and password are required.", {}
     
+    # Skip the network round-trip for obviously malformed addresses
+    if not _EMAIL_RE.match(email):
+        return False, "Invalid email or password. Please try again.", {}
+    
     try:
         # Attempt to sign in the user
         response = supabase.auth.sign_in_with_password({
@@ -244,15 +315,11 @@ def sign_in(email: str, password: str) -> Tuple[bool, str, Dict]:
     except Exception as e:
         # Handle specific error cases
         error_message = str(e)
+        friendly_message = _match_error(error_message, _SIGNIN_ERRORS)
         
-        if "invalid credentials" in error_message.lower() or "invalid login" in error_message.lower():
-            return False, "Invalid email or password. Please try again.", {}
-        elif "email not confirmed" in error_message.lower():
-            return False, "Please verify your email before signing in.", {}
-        elif "too many requests" in error_message.lower():
-            return False, "Too many login attempts. Please try again later.", {}
-        else:
-            return False, f"Sign in error: {error_message}", {}
+        if friendly_message:
+            return False, friendly_message, {}
+        return False, f"Sign in error: {error_message}", {}
 
 
 def sign_out() -> Tuple[bool, str]:
@@ -354,7 +421,7 @@ def reset_password(email: str) -> Tuple[bool, str]:
     if not supabase:
         return False, "Authentication service not configured. Please check your .env file."
     
-    if not email or "@" not in email:
+    if not email or not _EMAIL_RE.match(email):
         return False, "Please enter a valid email address."
     
     try:
@@ -0,0 +1,53 @@
+"""
+Environment Loader - MediGuard Drift AI
+Shared .env loading for the modules that read configuration from the environment
+"""
+
+import os
+import threading
+from dotenv import dotenv_values, find_dotenv
+
+# mtime of the .env file last applied, and the keys whose values came from it
+_loaded_mtime = None
+_file_keys = set()
+_load_lock = threading.Lock()
+
+
+def load_env_file(required: tuple = ()) -> None:
+    """
+    Apply the .env file to os.environ, re-reading it only when it changes
+
+    Variables already exported by the environment are never overridden.
+    Variables that came from the file are refreshed when the file's
+    modification time changes, so edits to .env reach later os.getenv calls.
+
+    Args:
+        required (tuple): Variables the calling module needs; if all of
+            them are exported by the environment (e.g. on Streamlit Cloud
+            or CI) rather than loaded from .env, the file is not read at all
+    """
+    global _loaded_mtime
+
+    # Exported values are final; keys that came from .env still need the
+    # mtime check below so edits to the file are picked up
+    if (required and all(os.environ.get(key) for key in required)
+            and not _file_keys.intersection(required)):
+        return
+
+    dotenv_path = find_dotenv()
+    if not dotenv_path:
+        return
+
+    with _load_lock:
+        mtime = os.path.getmtime(dotenv_path)
+        if mtime == _loaded_mtime:
+            return
+
+        for key, value in dotenv_values(dotenv_path).items():
+            if value is None:
+                continue
+            if key in _file_keys or key not in os.environ:
+                os.environ[key] = value
+                _file_keys.add(key)
+
+        _loaded_mtime = mtime
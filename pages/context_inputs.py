@@ -5,6 +5,7 @@ Page for collecting additional user context and health information
 
 import streamlit as st
 from auth.supabase_auth import get_supabase_client
+from storage.health_data_fetcher import clear_health_data_cache
 from datetime import datetime
 import os
 from PIL import Image
@@ -350,6 +351,7 @@ def save_context_to_supabase(user_id: str, context_data: dict, update_only_ai_fi
             # Insert or update context data
             response = supabase.table('user_context_data').upsert(data, on_conflict='user_id').execute()
         
+        clear_health_data_cache(user_id)
         return True, "Context data saved successfully!"
         
     except Exception as e:
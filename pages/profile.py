@@ -5,6 +5,7 @@ User context collection page for personalized health monitoring
 
 import streamlit as st
 from auth.supabase_auth import get_supabase_client
+from storage.health_data_fetcher import clear_health_data_cache
 from datetime import datetime
 
 
@@ -42,6 +43,7 @@ def save_user_profile(user_id: str, profile_data: dict) -> tuple[bool, str]:
         
         # Upsert (insert or update)
         response = supabase.table('user_profiles').upsert(data, on_conflict='user_id').execute()
+        clear_health_data_cache(user_id)
         
         return True, "Profile saved successfully!"
     except Exception as e:
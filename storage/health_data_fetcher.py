@@ -4,7 +4,9 @@ for AI agent analysis
 """
 
 from auth.supabase_auth import get_supabase_client
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+import threading
 import streamlit as st
 
 
@@ -37,45 +39,49 @@ def get_user_health_data(user_id: str, days: int = 14) -> dict:
             result['message'] = "Database not connected"
             return result
         
-        # 1. Fetch health check data (from daily health checks)
-        try:
-            cutoff_date = (datetime.now() - timedelta(days=days)).date().isoformat()
-            
-            health_response = supabase.table('health_checks')\
-                .select('*')\
-                .eq('user_id', user_id)\
-                .gte('check_date', cutoff_date)\
-                .order('check_date', desc=False)\
-                .execute()
-            
-            if health_response.data:
-                result['health_checks'] = health_response.data
-        except Exception as e:
-            result['message'] += f"Health checks error: {str(e)}; "
+        cutoff_date = (datetime.now() - timedelta(days=days)).date().isoformat()
         
-        # 2. Fetch context data (lifestyle, sleep, stress, etc.)
-        try:
-            context_response = supabase.table('user_context_data')\
-                .select('*')\
-                .eq('user_id', user_id)\
-                .execute()
-            
-            if context_response.data and len(context_response.data) > 0:
-                result['context_data'] = context_response.data[0]
-        except Exception as e:
-            result['message'] += f"Context data error: {str(e)}; "
+        # The three queries are independent, so run them concurrently and
+        # pay one round trip instead of three.
+        queries = {
+            # 1. Health check data (from daily health checks)
+            'health_checks': lambda: supabase.table('health_checks')
+                .select('*')
+                .eq('user_id', user_id)
+                .gte('check_date', cutoff_date)
+                .order('check_date', desc=False)
+                .execute(),
+            # 2. Context data (lifestyle, sleep, stress, etc.)
+            'context_data': lambda: supabase.table('user_context_data')
+                .select('*')
+                .eq('user_id', user_id)
+                .execute(),
+            # 3. User profile (age, name, lifestyle)
+            'profile': lambda: supabase.table('user_profiles')
+                .select('*')
+                .eq('user_id', user_id)
+                .execute(),
+        }
+        error_labels = {
+            'health_checks': "Health checks error",
+            'context_data': "Context data error",
+            'profile': "Profile error",
+        }
         
-        # 3. Fetch user profile (age, name, lifestyle)
-        try:
-            profile_response = supabase.table('user_profiles')\
-                .select('*')\
-                .eq('user_id', user_id)\
-                .execute()
+        with ThreadPoolExecutor(max_workers=len(queries)) as pool:
+            futures = {key: pool.submit(query) for key, query in queries.items()}
+        
+        for key, future in futures.items():
+            try:
+                response = future.result()
+            except Exception as e:
+                result['message'] += f"{error_labels[key]}: {str(e)}; "
+                continue
             
-            if profile_response.data and len(profile_response.data) > 0:
-                result['profile'] = profile_response.data[0]
-        except Exception as e:
-            result['message'] += f"Profile error: {str(e)}; "
+            if not response.data:
+                continue
+            # Health checks are a time series; context and profile are single rows
+            result[key] = response.data if key == 'health_checks' else response.data[0]
         
         # Check if we got at least health check data
         if result['health_checks']:
@@ -91,6 +97,54 @@ def get_user_health_data(user_id: str, days: int = 14) -> dict:
         return result
 
 
+class _HealthDataUnavailable(Exception):
+    """Carries a failed get_user_health_data result out of the cached fetch"""
+    
+    def __init__(self, result: dict):
+        super().__init__(result.get('message', ''))
+        self.result = result
+
+
+# Per-user cache generation, part of the cache key: bumping one user's
+# version skips their cached fetches without touching anyone else's
+_cache_versions = {}
+_cache_versions_lock = threading.Lock()
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _fetch_cached_health_data(user_id: str, days: int, version: int) -> dict:
+    # st.cache_data does not store results when the function raises, so
+    # failures are raised here and turned back into a result by the caller
+    result = get_user_health_data(user_id, days=days)
+    if not result['success']:
+        raise _HealthDataUnavailable(result)
+    return result
+
+
+def get_cached_user_health_data(user_id: str, days: int = 14) -> dict:
+    """
+    Cached get_user_health_data so Streamlit reruns reuse the last fetch
+    instead of querying Supabase again
+    
+    Only successful fetches are cached, so a transient database error or a
+    user with no health checks yet is retried on the next call. Entries
+    expire after 5 minutes; writers call clear_health_data_cache(user_id)
+    so a new health check, profile or context save shows up immediately.
+    """
+    with _cache_versions_lock:
+        version = _cache_versions.get(user_id, 0)
+    try:
+        return _fetch_cached_health_data(user_id, days, version)
+    except _HealthDataUnavailable as e:
+        return e.result
+
+
+def clear_health_data_cache(user_id: str) -> None:
+    """Invalidate the cached get_cached_user_health_data results for one user"""
+    with _cache_versions_lock:
+        _cache_versions[user_id] = _cache_versions.get(user_id, 0) + 1
+
+
 def format_data_for_agents(health_data: dict) -> dict:
     """
     Format the fetched data into the structure expected by ADK agents
@@ -6,6 +6,7 @@ Functions for storing and retrieving health check data from Supabase
 from typing import Dict, List, Any, Optional
 from datetime import datetime, date, timedelta
 from auth.supabase_auth import get_supabase_client
+from storage.health_data_fetcher import clear_health_data_cache
 
 
 def save_health_check(user_id: str, health_data: Dict[str, float], check_date: Optional[date] = None) -> Dict[str, Any]:
@@ -84,6 +85,7 @@ def save_health_check(user_id: str, health_data: Dict[str, float], check_date: O
         
         # Insert data (always create new record, allowing multiple checks per day)
         response = supabase.table('health_checks').insert(data).execute()
+        clear_health_data_cache(user_id)
         
         return {
             'success': True,